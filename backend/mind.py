@@ -1,11 +1,27 @@
 import os
+import re
+import math
+import heapq
+import asyncio
 import socket
-import json
+import orjson
+import aiofiles
+import aiofiles.os
 import uuid
 import logging
-import requests
-from bs4 import BeautifulSoup
+from collections import Counter, OrderedDict
+from itertools import chain
+from contextlib import asynccontextmanager
+import httpx
+import numpy as np
+from numba import njit
+from bs4 import BeautifulSoup, NavigableString, CData
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # fall back to BeautifulSoup with the lxml backend
+    HTMLParser = None
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 # --- Algorithmic Summarizers ---
@@ -18,59 +34,220 @@ from sumy.summarizers.text_rank import TextRankSummarizer
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared pooled client so repeat scrapes reuse keep-alive connections
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        http2=True,
+        timeout=10.0,
+        follow_redirects=True,
+    )
+    writer = asyncio.create_task(_writer())
+    try:
+        yield
+    finally:
+        await _WRITE_Q.join()
+        writer.cancel()
+        await app.state.http.aclose()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 scraped_data_dir = "scraped_data"
+# Minified JSON by default; set DEBUG to pretty-print saved files
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if os.getenv("DEBUG") else 0)
 os.makedirs(scraped_data_dir, exist_ok=True)
 
 # ---------- Utils ----------
 def get_free_port(start_port=8000):
-    port = start_port
+    """Return start_port if it is free, otherwise a kernel-assigned free port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(("0.0.0.0", start_port))
+        except OSError:
+            s.bind(("0.0.0.0", 0))
+        return s.getsockname()[1]
+
+# Saved files are written by a background task so requests never wait on disk
+_WRITE_Q: asyncio.Queue = asyncio.Queue(maxsize=1000)
+
+async def _writer():
     while True:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            if s.connect_ex(("0.0.0.0", port)) != 0:
-                return port
-            port += 1
+        path, blob = await _WRITE_Q.get()
+        try:
+            # Rename into place so a reader never sees a partial file
+            tmp_path = f"{path}.tmp"
+            async with aiofiles.open(tmp_path, "wb") as f:
+                await f.write(blob)
+            await aiofiles.os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"❌ Error saving {path}: {e}")
+        finally:
+            _WRITE_Q.task_done()
 
-def save_json(job_id, url, content, summary):
+async def save_json(job_id, url, content, summary):
     safe_name = url.replace("://", "_").replace("/", "_")
     path = os.path.join(scraped_data_dir, f"{safe_name}.json")
-    with open(path, "w") as f:
-        json.dump({"id": job_id, "url": url, "content": content, "summary": summary}, f, indent=2)
+    payload = {"id": job_id, "url": url, "content": content, "summary": summary}
+    await _WRITE_Q.put((path, orjson.dumps(payload, option=JSON_OPTIONS)))
     return path
 
 # ---------- Scraper ----------
-def scrape_website(url: str) -> str:
+MAX_HTML_CHARS = 80000  # HTML prefix downloaded per page
+MAX_TEXT_CHARS = 20000  # visible text kept per page
+SKIP_TAGS = frozenset({"script", "style", "nav", "footer", "header", "noscript"})
+
+def _walk_selectolax(root):
+    """Yield text nodes under root in document order, skipping non-content subtrees"""
+    # Explicit stack: recursion overflows on deeply nested pages
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.tag == "-text":
+            yield node.text(deep=False)
+        elif node.tag not in SKIP_TAGS:
+            stack.extend(reversed(list(node.iter(include_text=True))))
+
+def _walk_soup(root):
+    """Yield strings under root in document order, skipping non-content subtrees"""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if type(node) in (NavigableString, CData):
+            yield str(node)
+        elif getattr(node, "name", None) and node.name not in SKIP_TAGS:
+            stack.extend(reversed(node.contents))
+
+def _collect_text(strings, limit=MAX_TEXT_CHARS):
+    """Join whitespace-normalized strings, stopping once limit chars are reached"""
+    parts = []
+    total = 0
+    for string in strings:
+        words = string.split()
+        if not words:
+            continue
+        part = " ".join(words)
+        parts.append(part)
+        total += len(part) + 1
+        if total >= limit:
+            break
+    return " ".join(parts)
+
+def extract_text(html: str) -> str:
+    """Extract visible page text in a single pass over the DOM"""
+    if HTMLParser is not None:
+        # Walk the whole document, like the BeautifulSoup path, so <title> is kept
+        root = HTMLParser(html).root
+        return _collect_text(_walk_selectolax(root)) if root else ""
+    return _collect_text(_walk_soup(BeautifulSoup(html, "lxml")))
+
+async def scrape_website(url: str) -> str:
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        # Stream the body and stop once we have enough HTML for 20k chars of text
+        chunks = []
+        total = 0
+        async with app.state.http.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_text():
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= MAX_HTML_CHARS:
+                    break
+        html = "".join(chunks)
 
-        # Remove non-content tags
-        for tag in soup(["script", "style", "nav", "footer", "header", "noscript"]):
-            tag.extract()
-
-        text = " ".join(soup.stripped_strings)
-        return text[:20000]  # keep first 20k chars for performance
+        text = await asyncio.to_thread(extract_text, html)
+        return text[:MAX_TEXT_CHARS]  # keep first 20k chars for performance
     except Exception as e:
         logger.error(f"❌ Error scraping {url}: {e}")
         return ""
 
 # ---------- Summarization ----------
+# Tokenizer loads NLTK punkt data on construction, so build it once
+TOKENIZER = Tokenizer("english")
+
+MAX_SENTENCES = 50  # sentences kept before running LSA/TextRank
+_WORD_RE = re.compile(r'\w+')
+
+def prune_sentences(text, limit=MAX_SENTENCES):
+    """Keep the limit highest-scoring sentences (sum of inverse word frequency), in original order"""
+    # Same punkt splitter the summarizers use, so "Dr." or "e.g." don't end a sentence
+    sentences = TOKENIZER.to_sentences(text)
+    if len(sentences) <= limit:
+        return text
+
+    tokenized = [_WORD_RE.findall(s.lower()) for s in sentences]
+    counts = Counter(chain.from_iterable(tokenized))
+    total = sum(counts.values())
+    weights = {word: math.log(total / count) for word, count in counts.items()}
+    scores = [sum(weights[w] for w in words) for words in tokenized]
+
+    top = heapq.nlargest(limit, range(len(sentences)), key=scores.__getitem__)
+    return " ".join(sentences[i] for i in sorted(top))
+
+# Serial on purpose: requests call this from concurrent to_thread workers,
+# and Numba's default workqueue threading layer aborts on concurrent use
+@njit(cache=True)
+def sim_matrix(tokens, lengths):
+    """TextRank edge weights: |S_i ∩ S_j| / (log|S_i| + log|S_j|)"""
+    n = lengths.shape[0]
+    weights = np.zeros((n, n))
+    for i in range(n):
+        len_i = lengths[i]
+        for j in range(i, n):
+            len_j = lengths[j]
+            rank = 0
+            for a in range(len_i):
+                for b in range(len_j):
+                    if tokens[i, a] == tokens[j, b]:
+                        rank += 1
+            if rank == 0:
+                continue
+            norm = np.log(len_i) + np.log(len_j)
+            rating = float(rank) if abs(norm) < 1e-8 else rank / norm
+            weights[i, j] = rating
+            weights[j, i] = rating
+    return weights
+
+# Warm up the JIT at import so the first request doesn't pay compile time
+sim_matrix(np.zeros((1, 1), dtype=np.int32), np.ones(1, dtype=np.int32))
+
+class FastTextRank(TextRankSummarizer):
+    """TextRankSummarizer with the sentence-similarity loop compiled by Numba"""
+
+    def _create_matrix(self, document):
+        sentences_as_words = [self._to_words_set(s) for s in document.sentences]
+        count = len(sentences_as_words)
+        lengths = np.array([len(words) for words in sentences_as_words], dtype=np.int32)
+
+        # Map words to integer ids and pack them into a padded matrix
+        vocabulary = {}
+        tokens = np.full((count, max(lengths.max(initial=0), 1)), -1, dtype=np.int32)
+        for i, words in enumerate(sentences_as_words):
+            tokens[i, :len(words)] = [vocabulary.setdefault(w, len(vocabulary)) for w in words]
+
+        weights = sim_matrix(tokens, lengths)
+        weights /= (weights.sum(axis=1)[:, np.newaxis] + self._ZERO_DIVISION_PREVENTION)
+        return np.full((count, count), (1. - self.damping) / count) + self.damping * weights
+
 def algorithmic_summary(text, sentences=5, method="lsa"):
     """Generate summary using LSA or TextRank"""
-    parser = PlaintextParser.from_string(text, Tokenizer("english"))
+    parser = PlaintextParser.from_string(text, TOKENIZER)
     if method == "lsa":
         summarizer = LsaSummarizer()
     else:
-        summarizer = TextRankSummarizer()
+        summarizer = FastTextRank()
     summary = summarizer(parser.document, sentences)
     return " ".join([str(s) for s in summary])
 
-def hybrid_summary(text):
+def hybrid_summary(text, sentences=5):
     """Combine LSA + TextRank for robustness"""
-    lsa_summary = algorithmic_summary(text, method="lsa")
-    textrank_summary = algorithmic_summary(text, method="textrank")
+    # LSA's SVD and TextRank's pairwise similarity grow with sentence count,
+    # so trim to the most informative sentences first
+    text = prune_sentences(text)
+    # Parse once and share the document between both summarizers
+    document = PlaintextParser.from_string(text, TOKENIZER).document
+    lsa_summary = " ".join(map(str, LsaSummarizer()(document, sentences)))
+    textrank_summary = " ".join(map(str, FastTextRank()(document, sentences)))
     return f"LSA: {lsa_summary}\n\nTextRank: {textrank_summary}"
 
 # ---------- API Models ----------
@@ -78,7 +255,8 @@ class UpdateCellRequest(BaseModel):
     id: str
     content: str
 
-cells_store = {}  # in-memory store
+MAX_CELLS = 1000
+cells_store = OrderedDict()  # in-memory LRU store, capped at MAX_CELLS
 
 # ---------- Routes ----------
 @app.post("/scrape")
@@ -88,23 +266,29 @@ async def scrape(request: Request):
     job_id = str(uuid.uuid4())
     logger.info(f"🔎 Scraping {url} with job {job_id}")
 
-    scraped_text = scrape_website(url)
+    scraped_text = await scrape_website(url)
     if not scraped_text:
         return {"error": f"Could not scrape {url}"}
 
-    summary = hybrid_summary(scraped_text)
-    save_json(job_id, url, scraped_text, summary)
+    # LSA/TextRank are CPU-bound; keep them off the event loop
+    summary = await asyncio.to_thread(hybrid_summary, scraped_text)
+    await save_json(job_id, url, scraped_text, summary)
 
     return {"job_id": job_id, "summary": summary}
 
 @app.get("/get-text-cell")
 async def get_text_cell(id: str):
     content = cells_store.get(id, "")
+    if id in cells_store:
+        cells_store.move_to_end(id)
     return {"id": id, "content": content}
 
 @app.post("/update-text-cell")
 async def update_text_cell(req: UpdateCellRequest):
     cells_store[req.id] = req.content
+    cells_store.move_to_end(req.id)
+    if len(cells_store) > MAX_CELLS:
+        cells_store.popitem(last=False)
     return {"status": "ok", "id": req.id, "content": req.content}
 
 # ---------- Run ----------
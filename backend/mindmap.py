@@ -8,15 +8,35 @@ generating summaries, and creating mind maps.
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, HttpUrl
 from typing import Dict, List, Optional
-import requests
+from contextlib import asynccontextmanager
+import httpx
 from bs4 import BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # fall back to BeautifulSoup with the lxml backend
+    HTMLParser = None
+try:
+    import hyperscan
+except ImportError:  # fall back to the precompiled re patterns
+    hyperscan = None
 import re
-import json
+import textwrap
+import orjson
+import aiofiles
+import aiofiles.os
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
 import os
 from dataclasses import dataclass, asdict
+import functools
+import hashlib
+from collections import Counter, OrderedDict
+from itertools import chain
+import threading
+import time
 import uuid
 import asyncio
 from datetime import datetime
@@ -26,11 +46,150 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Ensure a folder exists to store JSON files
+STORAGE_DIR = "scraped_data"
+# Minified JSON by default; set DEBUG to pretty-print saved results
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if os.getenv('DEBUG') else 0)
+os.makedirs(STORAGE_DIR, exist_ok=True)
+
+def sanitize_filename(url: str) -> str:
+    """Convert URL into a safe filename"""
+    # Replace all non-alphanumeric characters with underscore
+    return _SAFE_RE.sub('_', url)
+
+def result_file_path(url: str, api_key: Optional[str], summary_length: int) -> str:
+    """Path of the result file for one (url, api_key, summary_length) request
+
+    The digest keeps requests with different options, and URLs that sanitize
+    to the same name, from overwriting each other's results.
+    """
+    digest = hashlib.sha256(repr((url, api_key, summary_length)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(STORAGE_DIR, f"{sanitize_filename(url)[:100]}_{digest}.json")
+
+# Result files are written by a single background task so jobs never wait on disk
+_WRITE_Q: asyncio.Queue = asyncio.Queue(maxsize=1000)
+
+async def save_json(path: str, payload: Dict, on_written=None) -> None:
+    """Queue a result for the background writer; on_written(error) runs after the write"""
+    await _WRITE_Q.put((path, orjson.dumps(payload, option=JSON_OPTIONS), on_written))
+
+async def _writer():
+    """Drain the write queue to disk"""
+    while True:
+        path, blob, on_written = await _WRITE_Q.get()
+        error = None
+        try:
+            # Write beside the target and rename it into place, so a reader
+            # never sees a partially written result
+            tmp_path = f"{path}.tmp"
+            async with aiofiles.open(tmp_path, "wb") as f:
+                await f.write(blob)
+            await aiofiles.os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to write {path}: {e}")
+            error = e
+        try:
+            if on_written:
+                on_written(error)
+        except Exception as e:
+            # A failing callback must not kill the writer and stall the queue
+            logger.error(f"Write callback for {path} failed: {e}")
+        finally:
+            _WRITE_Q.task_done()
+
+# Precompiled regexes used on every scrape/summary
+_SENT_SPLIT = re.compile(r'[.!?]+')
+_CAP_WORD = re.compile(r'\b[A-Z][a-zA-Z]+\b')
+_CAP_LONG = re.compile(r'\b[A-Z][a-zA-Z]{3,}\b')
+_TECH_RE = re.compile(
+    r'\b(?:cloud|platform|service|API|infrastructure|computing|data|security|network|database|server|application|software|technology|development|deployment|management|system)\w*\b',
+    re.IGNORECASE
+)
+_WS_RE = re.compile(r'\s+')
+_SAFE_RE = re.compile(r'[^0-9a-zA-Z]+')
+
+# NLTK's English stopword list, used to filter extracted key concepts
+STOPWORDS = frozenset({
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your',
+    'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she',
+    'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their',
+    'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that',
+    'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an',
+    'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of',
+    'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into',
+    'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from',
+    'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again',
+    'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how',
+    'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some',
+    'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too',
+    'very', 's', 't', 'can', 'will', 'just', 'don', 'should', 'now', 'd',
+    'll', 'm', 'o', 're', 've', 'y', 'ain', 'aren', 'couldn', 'didn',
+    'doesn', 'hadn', 'hasn', 'haven', 'isn', 'ma', 'mightn', 'mustn',
+    'needn', 'shan', 'shouldn', 'wasn', 'weren', 'won', 'wouldn'
+})
+
+# Hyperscan database matching the tech-term and capitalised-word patterns
+# in a single pass over the text
+_HS_TECH, _HS_CAP_LONG = 0, 1
+_HS_DB = None
+if hyperscan is not None:
+    try:
+        _HS_DB = hyperscan.Database()
+        _HS_DB.compile(
+            expressions=[_TECH_RE.pattern.encode(), _CAP_LONG.pattern.encode()],
+            ids=[_HS_TECH, _HS_CAP_LONG],
+            elements=2,
+            flags=[
+                hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_CASELESS,
+                hyperscan.HS_FLAG_SOM_LEFTMOST
+            ]
+        )
+    except Exception as e:
+        logger.warning(f"Hyperscan unavailable, using re for term scanning: {e}")
+        _HS_DB = None
+
+def _scan_terms(text: str):
+    """Return (tech_terms, capitalised_words) found in text"""
+    # The database uses ASCII \w/\b, which would split words like "Montréal"
+    if _HS_DB is None or not text.isascii():
+        return _TECH_RE.findall(text), _CAP_LONG.findall(text)
+    
+    data = text.encode('ascii')
+    matches = ([], [])
+    
+    def on_match(pattern_id, start, end, flags, context):
+        matches[pattern_id].append(data[start:end].decode('ascii'))
+    
+    _HS_DB.scan(data, match_event_handler=on_match)
+    return matches
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared HTTP client and result writer; flush and close them on shutdown"""
+    # One pooled client for all jobs so keep-alive connections are reused
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        http2=True,
+        timeout=10.0,
+        follow_redirects=True
+    )
+    app.state.scraper = WebScraper(app.state.http)
+    writer = asyncio.create_task(_writer())
+    try:
+        yield
+    finally:
+        await _WRITE_Q.join()
+        writer.cancel()
+        await app.state.http.aclose()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Website Scraper & Mind Map API",
     description="API for scraping website content and generating mind maps",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -42,8 +201,145 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for demo purposes (use a database in production)
-scrape_jobs = {}
+class S3FIFOCache:
+    """Bounded mapping with S3-FIFO eviction
+
+    New keys enter a small probationary FIFO; keys read while there are
+    promoted to the main FIFO, the rest are evicted and remembered in a
+    ghost queue so a quick re-insert goes straight to main. Main entries
+    get one reinsertion per read (up to 3) before they are evicted.
+    """
+    
+    def __init__(self, maxsize: int = 1000, small_ratio: float = 0.1):
+        self.maxsize = maxsize
+        self.small_size = max(1, int(maxsize * small_ratio))
+        self.main_size = max(1, maxsize - self.small_size)
+        self._data = {}
+        self._freq = {}
+        self._small = OrderedDict()
+        self._main = OrderedDict()
+        self._ghost = OrderedDict()
+        # BackgroundTasks may run sync work in threadpool workers
+        self._lock = threading.Lock()
+    
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._data
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+    
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._data[key]
+            self._freq[key] = min(self._freq[key] + 1, 3)
+            return value
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def __setitem__(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self._data[key] = value
+                self._freq[key] = min(self._freq[key] + 1, 3)
+                return
+            
+            while len(self._data) >= self.maxsize:
+                self._evict()
+            
+            self._data[key] = value
+            self._freq[key] = 0
+            if key in self._ghost:
+                del self._ghost[key]
+                self._main[key] = None
+            else:
+                self._small[key] = None
+    
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+            del self._freq[key]
+            self._small.pop(key, None)
+            self._main.pop(key, None)
+    
+    def values(self) -> List:
+        with self._lock:
+            return list(self._data.values())
+    
+    def _evict(self):
+        if len(self._small) >= self.small_size or not self._main:
+            self._evict_small()
+        else:
+            self._evict_main()
+    
+    def _evict_small(self):
+        while self._small:
+            key, _ = self._small.popitem(last=False)
+            if self._freq[key] > 0:
+                self._freq[key] = 0
+                self._main[key] = None
+                if len(self._main) > self.main_size:
+                    self._evict_main()
+                    return
+            else:
+                self._remove(key)
+                self._ghost[key] = None
+                if len(self._ghost) > self.main_size:
+                    self._ghost.popitem(last=False)
+                return
+        self._evict_main()
+    
+    def _evict_main(self):
+        while self._main:
+            key, _ = self._main.popitem(last=False)
+            if self._freq[key] > 0:
+                self._freq[key] -= 1
+                self._main[key] = None
+            else:
+                self._remove(key)
+                return
+    
+    def _remove(self, key):
+        del self._data[key]
+        del self._freq[key]
+
+# Bounded in-memory job storage (use a database in production)
+MAX_JOBS = int(os.getenv('MAX_JOBS', '1000'))
+scrape_jobs = S3FIFOCache(maxsize=MAX_JOBS)
+
+# Request coalescing: (url, api_key, summary_length) -> future resolved with
+# the leading job once it finishes. Lookups and inserts happen on the event
+# loop without awaiting in between, so no lock is needed.
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+# Recently completed results: same key -> (expires_at, result_path)
+RESULT_TTL = int(os.getenv('RESULT_TTL', '3600'))
+MAX_CACHED_RESULTS = 256
+_result_cache = OrderedDict()
+
+def get_cached_result(key: tuple) -> Optional[str]:
+    """Return the result path cached for key if it has not expired"""
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, path = entry
+    if expires_at < time.monotonic() or not os.path.exists(path):
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return path
+
+def cache_result(key: tuple, path: str) -> None:
+    """Remember a completed result path for RESULT_TTL seconds"""
+    _result_cache[key] = (time.monotonic() + RESULT_TTL, path)
+    _result_cache.move_to_end(key)
+    if len(_result_cache) > MAX_CACHED_RESULTS:
+        _result_cache.popitem(last=False)
 
 # Pydantic models for API requests/responses
 class ScrapeRequest(BaseModel):
@@ -98,76 +394,63 @@ class JobData:
     status: str
     progress: int
     result: Optional[Dict] = None
+    result_path: Optional[str] = None
     error: Optional[str] = None
     created_at: str = ""
     completed_at: Optional[str] = None
 
+def load_job_result(job: JobData) -> Optional[Dict]:
+    """Return a job's result, reading it back from disk if it was offloaded"""
+    # Read once: the background writer may clear job.result concurrently
+    result = job.result
+    if result is not None or not job.result_path:
+        return result
+    with open(job.result_path, "rb") as f:
+        return orjson.loads(f.read())
+
+SECTION_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p'})
+
 class WebScraper:
     """Handles web scraping functionality"""
     
-    def __init__(self, headers=None):
-        self.session = requests.Session()
+    def __init__(self, client: httpx.AsyncClient, headers=None):
+        self.client = client
         self.headers = headers or {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.session.headers.update(self.headers)
     
-    def scrape_content(self, url: str) -> Dict[str, any]:
+    async def scrape_content(self, url: str) -> Dict[str, any]:
         """Scrape content from the specified URL"""
         try:
-            response = self.session.get(str(url), timeout=10)
+            response = await self.client.get(str(url), headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                script.decompose()
-            
-            # Extract title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else "No Title"
-            
-            # Extract main content
-            content_selectors = [
-                'main', 'article', '[role="main"]', '.content', 
-                '.main-content', '#content', '.post-content'
-            ]
+            if HTMLParser is not None:
+                title_text, elements, all_text = await asyncio.to_thread(self._parse_selectolax, response.text)
+            else:
+                title_text, elements, all_text = await asyncio.to_thread(self._parse_soup, response.content)
             
-            main_content = None
-            for selector in content_selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
+            # Group paragraphs under the heading that precedes them
+            sections = []
+            current_section = {"title": title_text, "content": "", "keywords": []}
             
-            if not main_content:
-                main_content = soup.find('body')
+            for tag, text in elements:
+                if tag.startswith('h'):
+                    if current_section["content"].strip():
+                        sections.append(current_section)
+                    current_section = {
+                        "title": text,
+                        "content": "",
+                        "keywords": []
+                    }
+                elif text:
+                    current_section["content"] += text + " "
             
-            # Extract headings and paragraphs
-            sections = []
-            if main_content:
-                current_section = {"title": title_text, "content": "", "keywords": []}
-                
-                for element in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p']):
-                    if element.name.startswith('h'):
-                        if current_section["content"].strip():
-                            sections.append(current_section)
-                        current_section = {
-                            "title": element.get_text().strip(),
-                            "content": "",
-                            "keywords": []
-                        }
-                    elif element.name == 'p':
-                        text = element.get_text().strip()
-                        if text:
-                            current_section["content"] += text + " "
-                
-                if current_section["content"].strip():
-                    sections.append(current_section)
+            if current_section["content"].strip():
+                sections.append(current_section)
             
             # Extract all text as fallback
-            all_text = soup.get_text()
-            clean_text = re.sub(r'\s+', ' ', all_text).strip()
+            clean_text = _WS_RE.sub(' ', all_text).strip()
             
             return {
                 'url': str(url),
@@ -177,40 +460,127 @@ class WebScraper:
                 'word_count': len(clean_text.split())
             }
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Error scraping {url}: {str(e)}")
         except Exception as e:
             raise Exception(f"Error processing content from {url}: {str(e)}")
+    
+    def _parse_selectolax(self, html: str):
+        """Parse HTML with selectolax, returning (title, [(tag, text)], all_text)"""
+        tree = HTMLParser(html)
+        
+        # Remove script and style elements
+        for node in tree.css("script, style, nav, footer, header, aside"):
+            node.decompose()
+        
+        title = tree.css_first('title')
+        title_text = title.text().strip() if title else "No Title"
+        
+        # Extract main content
+        main_content = tree.css_first(
+            'main, article, [role="main"], .content, .main-content, #content, .post-content'
+        ) or tree.body
+        
+        elements = []
+        if main_content:
+            # traverse() walks in document order, unlike css() on older releases
+            elements = [
+                (node.tag, node.text().strip())
+                for node in main_content.traverse()
+                if node.tag in SECTION_TAGS
+            ]
+        
+        root = tree.root
+        all_text = root.text(separator=" ") if root else ""
+        return title_text, elements, all_text
+    
+    def _parse_soup(self, html: bytes):
+        """Parse HTML with BeautifulSoup/lxml, returning (title, [(tag, text)], all_text)"""
+        soup = BeautifulSoup(html, 'lxml')
+        
+        # Remove script and style elements
+        for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
+            script.decompose()
+        
+        title = soup.find('title')
+        title_text = title.get_text().strip() if title else "No Title"
+        
+        # Extract main content
+        content_selectors = [
+            'main', 'article', '[role="main"]', '.content', 
+            '.main-content', '#content', '.post-content'
+        ]
+        
+        main_content = None
+        for selector in content_selectors:
+            main_content = soup.select_one(selector)
+            if main_content:
+                break
+        
+        if not main_content:
+            main_content = soup.find('body')
+        
+        elements = []
+        if main_content:
+            elements = [
+                (element.name, element.get_text().strip())
+                for element in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p'])
+            ]
+        
+        return title_text, elements, soup.get_text()
 
 class ContentSummarizer:
     """Handles content summarization using AI"""
     
+    MODEL_NAMES = ('gemini-1.5-flash', 'gemini-pro', 'models/gemini-pro')
+    _model_name = None  # first model name that initialized successfully
+    
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv('GOOGLE_API_KEY')
         self.model = None
         
         if self.api_key:
             try:
-                genai.configure(api_key=self.api_key)
-                try:
-                    self.model = genai.GenerativeModel('gemini-1.5-flash')
-                except:
-                    try:
-                        self.model = genai.GenerativeModel('gemini-pro')
-                    except:
-                        self.model = genai.GenerativeModel('models/gemini-pro')
-                
+                self.model = self._create_model()
+                # genai.configure() is process-global, so bind this key to the
+                # model's own async client instead; cached summarizers for
+                # different keys then never share credentials. _async_client
+                # is private to google-generativeai 0.8.x, so refuse to run
+                # on the global key if a release drops it.
+                if not hasattr(self.model, "_async_client"):
+                    raise RuntimeError("google-generativeai 0.8.x is required for per-key clients")
+                self.model._async_client = glm.GenerativeServiceAsyncClient(
+                    client_options={"api_key": self.api_key}
+                )
                 logger.info("Google Gemini AI initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Google Gemini: {e}")
                 self.model = None
     
-    def summarize_content(self, content: Dict[str, any], max_length: int = 500) -> Dict[str, any]:
+    @classmethod
+    def _create_model(cls):
+        """Create the Gemini model, only probing model names on first use"""
+        if cls._model_name:
+            return genai.GenerativeModel(cls._model_name)
+        
+        for name in cls.MODEL_NAMES[:-1]:
+            try:
+                model = genai.GenerativeModel(name)
+            except Exception:
+                continue
+            cls._model_name = name
+            return model
+        
+        model = genai.GenerativeModel(cls.MODEL_NAMES[-1])
+        cls._model_name = cls.MODEL_NAMES[-1]
+        return model
+    
+    async def summarize_content(self, content: Dict[str, any], max_length: int = 500) -> Dict[str, any]:
         """Generate a summary of the scraped content"""
         full_text = content['full_text']
         
         if not self.api_key or not self.model:
-            return self._extractive_summary(content, max_length)
+            return await asyncio.to_thread(self._extractive_summary, content, max_length)
         
         try:
             prompt = f"""You are a helpful assistant that creates concise summaries and identifies key concepts. 
@@ -225,11 +595,13 @@ class ContentSummarizer:
             2. Key concepts (comma-separated list)
             """
             
-            response = self.model.generate_content(prompt)
+            # Summary and key-concept prompts are independent, so run them concurrently
+            response, key_concepts = await asyncio.gather(
+                self.model.generate_content_async(prompt),
+                self._extract_key_concepts_ai(full_text)
+            )
             summary_text = response.text
             
-            key_concepts = self._extract_key_concepts_ai(full_text)
-            
             return {
                 'summary': summary_text,
                 'key_concepts': key_concepts,
@@ -238,7 +610,7 @@ class ContentSummarizer:
             
         except Exception as e:
             logger.error(f"Google AI summarization failed: {e}")
-            return self._extractive_summary(content, max_length)
+            return await asyncio.to_thread(self._extractive_summary, content, max_length)
     
     def _extractive_summary(self, content: Dict[str, any], max_length: int) -> Dict[str, any]:
         """Fallback extractive summarization method"""
@@ -246,31 +618,28 @@ class ContentSummarizer:
         full_text = content['full_text']
         
         summary_parts = []
-        key_concepts = set()
         
         for section in sections[:5]:
             section_text = section['content'].strip()
             if section_text:
-                sentences = re.split(r'[.!?]+', section_text)
+                sentences = _SENT_SPLIT.split(section_text)
                 if sentences:
                     first_sentence = sentences[0].strip()
                     if len(first_sentence) > 20:
                         summary_parts.append(first_sentence)
-                
-                title_words = re.findall(r'\b[A-Z][a-zA-Z]+\b', section['title'])
-                content_words = re.findall(r'\b[A-Z][a-zA-Z]+\b', section_text)
-                key_concepts.update(title_words[:2])
-                key_concepts.update(content_words[:2])
         
-        title_concepts = re.findall(r'\b[A-Z][a-zA-Z]+\b', content['title'])
-        key_concepts.update(title_concepts)
-        
-        tech_terms = re.findall(r'\b(?:cloud|platform|service|API|infrastructure|computing|data|security|network|database|server|application|software|technology|development|deployment|management|system)\w*\b', full_text.lower())
-        key_concepts.update([term.title() for term in tech_terms[:5]])
-        
-        if not key_concepts:
-            important_words = re.findall(r'\b[A-Z][a-zA-Z]{3,}\b', full_text)
-            key_concepts.update(important_words[:8])
+        # Rank tech terms and capitalised words by frequency; title words go first
+        tech_terms, important_words = _scan_terms(full_text)
+        counts = Counter(
+            term for term in chain((t.title() for t in tech_terms), important_words)
+            if len(term) > 2 and term.lower() not in STOPWORDS
+        )
+        title_concepts = [
+            word for word in _CAP_WORD.findall(content['title'])
+            if len(word) > 2 and word.lower() not in STOPWORDS
+        ]
+        ranked_concepts = [term for term, _ in counts.most_common(10)]
+        key_concepts = list(dict.fromkeys(title_concepts + ranked_concepts))[:10]
         
         summary = '. '.join(summary_parts) if summary_parts else "Content overview available in full text."
         
@@ -278,18 +647,13 @@ class ContentSummarizer:
         if len(words) > max_length:
             summary = ' '.join(words[:max_length]) + '...'
         
-        filtered_concepts = []
-        for concept in key_concepts:
-            if len(concept) > 2 and concept.lower() not in ['the', 'and', 'for', 'are', 'with']:
-                filtered_concepts.append(concept)
-        
         return {
             'summary': summary,
-            'key_concepts': list(set(filtered_concepts))[:10],
+            'key_concepts': key_concepts,
             'method': 'extractive'
         }
     
-    def _extract_key_concepts_ai(self, text: str) -> List[str]:
+    async def _extract_key_concepts_ai(self, text: str) -> List[str]:
         """Extract key concepts using Google Gemini AI"""
         try:
             prompt = f"""Extract 8-12 key concepts or topics from the following text. 
@@ -298,7 +662,7 @@ class ContentSummarizer:
             Text: {text[:6000]}
             """
             
-            response = self.model.generate_content(prompt)
+            response = await self.model.generate_content_async(prompt)
             concepts_text = response.text.strip()
             
             concepts = [concept.strip() for concept in concepts_text.split(',')]
@@ -309,6 +673,28 @@ class ContentSummarizer:
             logger.error(f"Key concept extraction failed: {e}")
             return []
 
+# Summarizers whose Gemini model initialized, most recently used last
+MAX_SUMMARIZERS = 4
+_summarizers: "OrderedDict[Optional[str], ContentSummarizer]" = OrderedDict()
+
+def get_summarizer(api_key: Optional[str]) -> ContentSummarizer:
+    """Return a shared ContentSummarizer per API key
+
+    A summarizer whose model failed to initialize is not kept, so the next
+    job retries the setup instead of staying on the extractive path.
+    """
+    summarizer = _summarizers.get(api_key)
+    if summarizer is not None:
+        _summarizers.move_to_end(api_key)
+        return summarizer
+    
+    summarizer = ContentSummarizer(api_key)
+    if summarizer.model is not None:
+        _summarizers[api_key] = summarizer
+        if len(_summarizers) > MAX_SUMMARIZERS:
+            _summarizers.popitem(last=False)
+    return summarizer
+
 class MindMapGenerator:
     """Generates text-based mind maps from content summaries"""
     
@@ -328,11 +714,12 @@ class MindMapGenerator:
         title_content = f"║  {title.upper()}  ║"
         title_bottom = f"╚{'═' * (len(title) + 4)}╝"
         
+        pad = " " * max(0, 40 - len(title)//2)
         lines.extend([
             "",
-            " " * (40 - len(title)//2) + title_box,
-            " " * (40 - len(title)//2) + title_content,
-            " " * (40 - len(title)//2) + title_bottom,
+            pad + title_box,
+            pad + title_content,
+            pad + title_bottom,
             ""
         ])
         
@@ -358,14 +745,9 @@ class MindMapGenerator:
                     concept = right_concepts[i]
                     right_text = f"📌 {concept} ──┤"
                 
-                if left_text and right_text:
-                    line = f"{left_text:<35}│{right_text:>35}"
-                elif left_text:
-                    line = f"{left_text:<35}│"
-                elif right_text:
-                    line = f"{'':<35}│{right_text:>35}"
-                else:
-                    line = f"{'':<35}│"
+                line = left_text.ljust(35) + "│"
+                if right_text:
+                    line += right_text.rjust(35)
                 
                 lines.append(line)
         
@@ -376,18 +758,7 @@ class MindMapGenerator:
             "├" + "─" * 78 + "┤"
         ])
         
-        summary_words = summary.split()
-        current_line = "│ "
-        
-        for word in summary_words:
-            if len(current_line + word + " ") > 77:
-                lines.append(current_line + " " * (78 - len(current_line)) + "│")
-                current_line = "│ " + word + " "
-            else:
-                current_line += word + " "
-        
-        if current_line.strip() != "│":
-            lines.append(current_line + " " * (78 - len(current_line)) + "│")
+        lines.extend("│ " + w.ljust(76) + " │" for w in textwrap.wrap(summary, width=76))
         
         lines.append("└" + "─" * 78 + "┘")
         
@@ -446,36 +817,59 @@ class MindMapGenerator:
         
         return "\n".join(lines)
 
+# Mind map generation is stateless, so one instance serves every job
+_MINDMAP = MindMapGenerator()
+
+@functools.lru_cache(maxsize=512)
+def _cached_mindmaps(title: str, concepts: tuple, summary: str) -> tuple:
+    """Build (visual, network, hierarchical) mind maps, memoized on their inputs"""
+    key_concepts = list(concepts)
+    return (
+        _MINDMAP._generate_text_mindmap(title, summary, key_concepts),
+        _MINDMAP._create_network_mind_map(title, key_concepts),
+        _MINDMAP._create_hierarchical_mindmap(title, key_concepts)
+    )
+
 async def process_scrape_job(job_id: str, url: str, api_key: str, summary_length: int):
-    """Background task to process scraping job"""
+    """Background task to process scraping job and save result locally"""
+    key = (url, api_key, summary_length)
+    handed_off = False
+    # The job may have been deleted or evicted before this task started; keep
+    # processing on a detached record so duplicates waiting on it still resolve
+    job = scrape_jobs.get(job_id) or JobData(
+        job_id=job_id,
+        status="queued",
+        progress=0,
+        created_at=datetime.now().isoformat()
+    )
     try:
-        job = scrape_jobs[job_id]
         job.status = "processing"
         job.progress = 10
         
         # Initialize components
-        scraper = WebScraper()
-        summarizer = ContentSummarizer(api_key)
-        mind_map_gen = MindMapGenerator()
+        scraper = app.state.scraper
+        summarizer = get_summarizer(api_key)
         
         # Scrape content
         logger.info(f"Scraping content from: {url}")
         job.progress = 30
-        content = scraper.scrape_content(url)
+        content = await scraper.scrape_content(url)
         
         # Generate summary
         logger.info("Generating summary...")
         job.progress = 60
-        summary_data = summarizer.summarize_content(content, summary_length)
+        summary_data = await summarizer.summarize_content(content, summary_length)
         
         # Generate mind maps
         logger.info("Creating mind maps...")
         job.progress = 80
-        mind_maps = mind_map_gen.create_mind_maps(
+        visual, network, hierarchical = await asyncio.to_thread(
+            _cached_mindmaps,
             content['title'],
-            summary_data['summary'],
-            summary_data['key_concepts']
+            tuple(summary_data['key_concepts']),
+            summary_data['summary']
         )
+        mind_maps = {'visual': visual, 'network': network, 'hierarchical': hierarchical}
         
         # Prepare final result
         result = {
@@ -484,18 +878,60 @@ async def process_scrape_job(job_id: str, url: str, api_key: str, summary_length
             'mind_maps': mind_maps
         }
         
+        # Save result to a local JSON file named after the sanitized URL and request key
+        file_path = result_file_path(url, api_key, summary_length)
+        
+        def on_written(error):
+            # Once on disk keep only the path; the payload is re-read on demand
+            if error is None:
+                job.result = None
+                cache_result(key, file_path)
+            _resolve_inflight(key, job)
+        
+        # Serve the result from memory until the background writer flushes it
         job.result = result
+        job.result_path = file_path
         job.status = "completed"
         job.progress = 100
         job.completed_at = datetime.now().isoformat()
-        
-        logger.info(f"Job {job_id} completed successfully")
+        await save_json(file_path, result, on_written)
+        handed_off = True
+        logger.info(f"Job {job_id} completed successfully, saving to {file_path}")
         
     except Exception as e:
         logger.error(f"Job {job_id} failed: {str(e)}")
         job.status = "failed"
         job.error = str(e)
         job.completed_at = datetime.now().isoformat()
+    
+    finally:
+        if not handed_off:
+            _resolve_inflight(key, job)
+
+def _resolve_inflight(key: tuple, job: JobData) -> None:
+    """Hand a finished job to any duplicate jobs waiting on it"""
+    inflight = _inflight.pop(key, None)
+    if inflight is not None and not inflight.done():
+        inflight.set_result(job)
+
+async def follow_scrape_job(job_id: str, inflight: asyncio.Future):
+    """Background task for a duplicate request: reuse the in-flight job's outcome"""
+    # Like the leader, tolerate the job having been deleted or evicted
+    job = scrape_jobs.get(job_id) or JobData(
+        job_id=job_id,
+        status="queued",
+        progress=0,
+        created_at=datetime.now().isoformat()
+    )
+    job.status = "processing"
+    
+    leader = await inflight
+    job.status = leader.status
+    job.progress = leader.progress
+    job.result = leader.result
+    job.result_path = leader.result_path
+    job.error = leader.error
+    job.completed_at = leader.completed_at
 
 # API Endpoints
 
@@ -531,13 +967,41 @@ async def create_scrape_job(request: ScrapeRequest, background_tasks: Background
         created_at=datetime.now().isoformat()
     )
     
+    url = str(request.url)
+    key = (url, request.api_key, request.summary_length)
+    
+    # Serve a recent identical request straight from the result cache
+    cached_path = get_cached_result(key)
+    if cached_path:
+        job.status = "completed"
+        job.progress = 100
+        job.result_path = cached_path
+        job.completed_at = datetime.now().isoformat()
+        scrape_jobs[job_id] = job
+        return ScrapeResponse(
+            job_id=job_id,
+            status="completed",
+            message="Result served from cache"
+        )
+    
     scrape_jobs[job_id] = job
     
+    # Attach to an identical job that is already running
+    if key in _inflight:
+        background_tasks.add_task(follow_scrape_job, job_id, _inflight[key])
+        return ScrapeResponse(
+            job_id=job_id,
+            status="queued",
+            message="Joined in-progress scraping job"
+        )
+    
+    _inflight[key] = asyncio.get_running_loop().create_future()
+    
     # Start background processing
     background_tasks.add_task(
         process_scrape_job, 
         job_id, 
-        str(request.url), 
+        url, 
         request.api_key, 
         request.summary_length
     )
@@ -559,7 +1023,7 @@ async def get_job_status(job_id: str):
         job_id=job.job_id,
         status=job.status,
         progress=job.progress,
-        result=job.result,
+        result=await asyncio.to_thread(load_job_result, job),
         error=job.error,
         created_at=job.created_at,
         completed_at=job.completed_at
@@ -605,7 +1069,7 @@ async def get_job_result(job_id: str):
             detail=f"Job is not completed. Current status: {job.status}"
         )
     
-    return job.result
+    return await asyncio.to_thread(load_job_result, job)
 
 @app.get("/job/{job_id}/mindmaps")
 async def get_job_mindmaps(job_id: str):
@@ -621,76 +1085,8 @@ async def get_job_mindmaps(job_id: str):
             detail=f"Job is not completed. Current status: {job.status}"
         )
     
-    return job.result.get('mind_maps', {})
-import os
-import json
-import re
-from datetime import datetime
-
-# Ensure a folder exists to store JSON files
-STORAGE_DIR = "scraped_data"
-os.makedirs(STORAGE_DIR, exist_ok=True)
-
-def sanitize_filename(url: str) -> str:
-    """Convert URL into a safe filename"""
-    # Replace all non-alphanumeric characters with underscore
-    return re.sub(r'[^0-9a-zA-Z]+', '_', url)
-
-async def process_scrape_job(job_id: str, url: str, api_key: str, summary_length: int):
-    """Background task to process scraping job and save result locally"""
-    try:
-        job = scrape_jobs[job_id]
-        job.status = "processing"
-        job.progress = 10
-        
-        # Initialize components
-        scraper = WebScraper()
-        summarizer = ContentSummarizer(api_key)
-        mind_map_gen = MindMapGenerator()
-        
-        # Scrape content
-        logger.info(f"Scraping content from: {url}")
-        job.progress = 30
-        content = scraper.scrape_content(url)
-        
-        # Generate summary
-        logger.info("Generating summary...")
-        job.progress = 60
-        summary_data = summarizer.summarize_content(content, summary_length)
-        
-        # Generate mind maps
-        logger.info("Creating mind maps...")
-        job.progress = 80
-        mind_maps = mind_map_gen.create_mind_maps(
-            content['title'],
-            summary_data['summary'],
-            summary_data['key_concepts']
-        )
-        
-        # Prepare final result
-        result = {
-            'scraped_content': content,
-            'summary': summary_data,
-            'mind_maps': mind_maps
-        }
-        
-        # Save result to local JSON file using sanitized URL as filename
-        safe_filename = sanitize_filename(url)
-        file_path = os.path.join(STORAGE_DIR, f"{safe_filename}.json")
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-        
-        job.result = result
-        job.status = "completed"
-        job.progress = 100
-        job.completed_at = datetime.now().isoformat()
-        logger.info(f"Job {job_id} completed successfully and saved to {file_path}")
-        
-    except Exception as e:
-        logger.error(f"Job {job_id} failed: {str(e)}")
-        job.status = "failed"
-        job.error = str(e)
-        job.completed_at = datetime.now().isoformat()
+    result = await asyncio.to_thread(load_job_result, job)
+    return result.get('mind_maps', {})
 
 if __name__ == "__main__":
     import uvicorn
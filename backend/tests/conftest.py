@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The backend modules are plain scripts, so make them importable from tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
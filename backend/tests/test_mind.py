@@ -0,0 +1,70 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("numba")
+pytest.importorskip("fastapi")
+pytest.importorskip("sumy")
+
+try:
+    import mind
+except LookupError:  # NLTK punkt data is not installed
+    pytest.skip("NLTK punkt data not available", allow_module_level=True)
+
+from sumy.parsers.plaintext import PlaintextParser
+from sumy.summarizers.text_rank import TextRankSummarizer
+
+TEXT = (
+    "Cloud platforms run managed databases. "
+    "Managed databases store data for every team. "
+    "Every team deploys services on the cloud platform. "
+    "Security features protect stored data. "
+    "Unrelated sentence here. "
+    # One-word sentences take the zero-norm branch
+    "Data. Data."
+)
+
+
+def test_fast_text_rank_matrix_matches_sumy():
+    document = PlaintextParser.from_string(TEXT, mind.TOKENIZER).document
+
+    expected = TextRankSummarizer()._create_matrix(document)
+    actual = mind.FastTextRank()._create_matrix(document)
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+
+
+PAGE = (
+    "<html><head><title>Guide</title><style>p {}</style></head>"
+    "<body><nav>Menu</nav><h1>Intro</h1><p>First  <b>bold</b> text.</p>"
+    "<script>var x;</script><!-- note --><p>Second</p></body></html>"
+)
+
+
+@pytest.mark.parametrize("parser", ["selectolax", "soup"])
+def test_extract_text_keeps_title_and_skips_non_content(parser, monkeypatch):
+    if parser == "soup":
+        monkeypatch.setattr(mind, "HTMLParser", None)
+    elif mind.HTMLParser is None:
+        pytest.skip("selectolax not installed")
+
+    assert mind.extract_text(PAGE) == "Guide Intro First bold text. Second"
+
+
+@pytest.mark.parametrize("parser", ["selectolax", "soup"])
+def test_extract_text_handles_deep_nesting(parser, monkeypatch):
+    if parser == "soup":
+        monkeypatch.setattr(mind, "HTMLParser", None)
+    elif mind.HTMLParser is None:
+        pytest.skip("selectolax not installed")
+    html = "<html><body>" + "<div>" * 5000 + "deep" + "</div>" * 5000 + "</body></html>"
+
+    assert mind.extract_text(html) == "deep"
+
+
+def test_prune_sentences_keeps_abbreviations_inside_sentences():
+    filler = " ".join(f"Filler sentence number {i} repeats words." for i in range(6))
+    text = "Dr. Smith studied rare isotopes, e.g. tritium, in Geneva. " + filler
+
+    pruned = mind.prune_sentences(text, limit=1)
+
+    assert pruned == "Dr. Smith studied rare isotopes, e.g. tritium, in Geneva."
@@ -0,0 +1,250 @@
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("google.generativeai")
+httpx = pytest.importorskip("httpx")
+
+import mindmap
+
+PAGE = b"""
+<html>
+  <head><title>Cloud Platform Guide</title></head>
+  <body>
+    <nav>Skip this navigation</nav>
+    <main>
+      <h1>Introduction</h1>
+      <p>The Cloud platform offers managed Database services for every team.</p>
+      <h2>Security</h2>
+      <p>Security features protect Data stored on the Platform network.</p>
+    </main>
+  </body>
+</html>
+"""
+
+
+@pytest.fixture
+def run_scrape(tmp_path, monkeypatch):
+    """Run a coroutine against a site serving PAGE, with isolated module state"""
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.setattr(mindmap, "STORAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(mindmap, "scrape_jobs", mindmap.S3FIFOCache(maxsize=10))
+    monkeypatch.setattr(mindmap, "_summarizers", OrderedDict())
+    monkeypatch.setattr(mindmap, "_inflight", {})
+    monkeypatch.setattr(mindmap, "_result_cache", OrderedDict())
+
+    def handler(request):
+        return httpx.Response(200, content=PAGE, headers={"content-type": "text/html"})
+
+    async def main(make_coro):
+        # Fresh queue so it binds to this test's event loop
+        monkeypatch.setattr(mindmap, "_WRITE_Q", asyncio.Queue())
+        writer = asyncio.create_task(mindmap._writer())
+        try:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                monkeypatch.setattr(mindmap.app.state, "scraper", mindmap.WebScraper(client), raising=False)
+                outcome = await make_coro()
+            await mindmap._WRITE_Q.join()
+            return outcome
+        finally:
+            writer.cancel()
+
+    return lambda make_coro: asyncio.run(main(make_coro))
+
+
+def test_process_scrape_job_completes_with_extractive_summary(run_scrape):
+    job = mindmap.JobData(job_id="job-1", status="queued", progress=0)
+    mindmap.scrape_jobs["job-1"] = job
+
+    run_scrape(lambda: mindmap.process_scrape_job("job-1", "https://example.com/guide", None, 50))
+
+    assert job.status == "completed", job.error
+    # Once written, the payload is only kept on disk
+    assert job.result is None
+    result = mindmap.load_job_result(job)
+    assert result["scraped_content"]["title"] == "Cloud Platform Guide"
+    assert [s["title"] for s in result["scraped_content"]["sections"]] == ["Introduction", "Security"]
+    assert result["summary"]["method"] == "extractive"
+    assert "Cloud" in result["summary"]["key_concepts"]
+    assert set(result["mind_maps"]) == {"visual", "network", "hierarchical"}
+
+
+def test_summarizers_are_shared_per_key_with_their_own_client(monkeypatch):
+    keys = []
+
+    class FakeAsyncClient:
+        def __init__(self, client_options):
+            keys.append(client_options["api_key"])
+
+    monkeypatch.setattr(mindmap.glm, "GenerativeServiceAsyncClient", FakeAsyncClient)
+    monkeypatch.setattr(mindmap, "_summarizers", OrderedDict())
+
+    first = mindmap.get_summarizer("key-a")
+
+    assert mindmap.get_summarizer("key-a") is first
+    assert mindmap.get_summarizer("key-b") is not first
+    assert keys == ["key-a", "key-b"]
+
+
+def test_failed_summarizer_setup_is_not_cached(monkeypatch):
+    def broken(cls):
+        raise RuntimeError("invalid model")
+
+    monkeypatch.setattr(mindmap.ContentSummarizer, "_create_model", classmethod(broken))
+    monkeypatch.setattr(mindmap, "_summarizers", OrderedDict())
+
+    first = mindmap.get_summarizer("key-a")
+
+    assert first.model is None
+    assert mindmap.get_summarizer("key-a") is not first
+
+
+def test_parse_selectolax_keeps_document_order():
+    if mindmap.HTMLParser is None:
+        pytest.skip("selectolax not installed")
+    html = "<main><h2>A</h2><p>pa</p><div><h2>B</h2><p>pb</p></div></main>"
+    _, elements, _ = mindmap.WebScraper(None)._parse_selectolax(html)
+
+    assert elements == [("h2", "A"), ("p", "pa"), ("h2", "B"), ("p", "pb")]
+
+
+def test_result_file_path_is_unique_per_request():
+    paths = {
+        mindmap.result_file_path("https://x.com/x-y", None, 300),
+        mindmap.result_file_path("https://x.com/x_y", None, 300),
+        mindmap.result_file_path("https://x.com/x-y", None, 100),
+        mindmap.result_file_path("https://x.com/x-y", "key", 300),
+    }
+
+    assert len(paths) == 4
+
+
+@pytest.mark.parametrize("text", [
+    "The Cloud platform runs APIs. Databases and Security matter; Kubernetes manages Deployment systems.",
+    "Montréal hosts Données platforms and Sécurité services near Québec.",
+])
+def test_scan_terms_matches_re(text):
+    tech_terms, capitalised = mindmap._scan_terms(text)
+
+    assert tech_terms == mindmap._TECH_RE.findall(text)
+    assert capitalised == mindmap._CAP_LONG.findall(text)
+
+
+def test_deleted_leader_still_resolves_duplicates(run_scrape):
+    key = ("https://example.com/gone", None, 50)
+
+    async def run():
+        future = asyncio.get_running_loop().create_future()
+        mindmap._inflight[key] = future
+        # Leader job was never stored (e.g. deleted before the task ran)
+        await mindmap.process_scrape_job("missing-job", *key)
+        return future
+
+    future = run_scrape(run)
+
+    assert future.done()
+    assert future.result().status == "completed"
+    assert key not in mindmap._inflight
+
+
+def test_deleted_follower_still_consumes_leader_outcome(run_scrape):
+    async def run():
+        future = asyncio.get_running_loop().create_future()
+        follower = asyncio.create_task(mindmap.follow_scrape_job("missing-job", future))
+        future.set_result(mindmap.JobData(job_id="leader", status="completed", progress=100))
+        await follower
+
+    run_scrape(run)
+
+    assert "missing-job" not in mindmap.scrape_jobs
+
+
+CONTENT = {
+    "title": "Cloud Guide",
+    "full_text": "Kubernetes schedules pods. Kubernetes scales them. The Database stores Data. Kubernetes heals.",
+    "sections": [{"title": "Intro", "content": "Kubernetes schedules pods across the cluster. More text", "keywords": []}],
+}
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    """A ContentSummarizer on the extractive path; tests may set a fake model"""
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    return mindmap.ContentSummarizer()
+
+
+def test_extractive_key_concepts_are_ranked_by_frequency(summarizer):
+    result = summarizer._extractive_summary(CONTENT, 50)
+
+    # Title words first, then terms by frequency
+    assert result["key_concepts"][:3] == ["Cloud", "Guide", "Kubernetes"]
+    assert set(result["key_concepts"]) == {"Cloud", "Guide", "Kubernetes", "Database", "Data"}
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Stands in for a Gemini model; records how many prompts overlap"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.active = 0
+        self.max_active = 0
+
+    async def generate_content_async(self, prompt):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        if prompt.startswith("Extract"):
+            return FakeResponse("Kubernetes, Pods, Scaling")
+        return FakeResponse("A short summary.")
+
+
+def test_summarize_content_runs_gemini_prompts_concurrently(summarizer):
+    summarizer.api_key, summarizer.model = "test-key", FakeModel()
+    result = asyncio.run(summarizer.summarize_content(CONTENT, 50))
+
+    assert result == {
+        "summary": "A short summary.",
+        "key_concepts": ["Kubernetes", "Pods", "Scaling"],
+        "method": "ai_powered_gemini",
+    }
+    assert summarizer.model.max_active == 2
+
+
+def test_summarize_content_falls_back_to_extractive_on_error(summarizer):
+    summarizer.api_key, summarizer.model = "test-key", FakeModel(fail=True)
+    result = asyncio.run(summarizer.summarize_content(CONTENT, 50))
+
+    assert result["method"] == "extractive"
+    assert result["summary"] == "Kubernetes schedules pods across the cluster"
+
+
+def test_writer_survives_failing_callback(tmp_path, monkeypatch):
+    written = []
+
+    def broken(error):
+        raise RuntimeError("callback bug")
+
+    async def run():
+        monkeypatch.setattr(mindmap, "_WRITE_Q", asyncio.Queue())
+        writer = asyncio.create_task(mindmap._writer())
+        await mindmap.save_json(str(tmp_path / "a.json"), {"a": 1}, broken)
+        await mindmap.save_json(str(tmp_path / "b.json"), {"b": 2}, written.append)
+        await asyncio.wait_for(mindmap._WRITE_Q.join(), timeout=5)
+        alive = not writer.done()
+        writer.cancel()
+        return alive
+
+    assert asyncio.run(run())
+    assert written == [None]
+    assert (tmp_path / "b.json").read_bytes() == b'{"b":2}'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.json", "b.json"]